@@ -30,3 +30,12 @@ class InvalidSortFieldError(Exception):
     Attributes:
         message -- explanation of the error
     """
+
+
+class InvalidCursorError(Exception):
+    """
+    Exception raised when a pagination cursor cannot be decoded.
+
+    Attributes:
+        message -- explanation of the error
+    """
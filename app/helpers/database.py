@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Any, Dict, Iterator
 
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
@@ -8,6 +8,31 @@ from sqlalchemy.orm import sessionmaker
 from app.helpers.environment import env
 
 
+def engine_options(database_type: str) -> Dict[str, Any]:
+    """
+    Connection pool options for the given database type.
+
+    SQLite keeps SQLAlchemy's default pool, server databases get a pool sized
+    for concurrent requests that also recovers from dropped connections.
+
+    Args:
+        database_type (str): The database type, e.g. 'sqlite', 'psql' or 'mysql'.
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for create_engine.
+    """
+    if database_type == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+
+    return {
+        "pool_size": 20,  # Connections kept open in the pool
+        "max_overflow": 10,  # Extra connections allowed during bursts
+        "pool_timeout": 30,  # Seconds to wait for a free connection
+        "pool_pre_ping": True,  # Replace connections closed by the server
+        "pool_recycle": 3600,  # Recycle connections before server timeouts
+    }
+
+
 def create_database_engine() -> Engine:
     settings = env()
     database_type = settings.DB_TYPE
@@ -44,15 +69,7 @@ def create_database_engine() -> Engine:
                 ssl_ca=settings.DB_SSL_CA,
                 ssl_verify_cert=settings.DB_SSL_VERIFY_CERT,
             )
-        return create_engine(
-            database_url,
-            pool_size=30,  # Adjust pool size
-            max_overflow=20,  # Adjust max overflow
-            pool_timeout=30,  # Adjust pool timeout
-            connect_args={"check_same_thread": False}
-            if database_type == "sqlite"
-            else {},
-        )
+        return create_engine(database_url, **engine_options(database_type))
 
     raise ValueError(f"Unsupported database type: {database_type}")
 
@@ -63,3 +80,20 @@ Session = sessionmaker(bind=engine)
 
 def db() -> SQLAlchemySession:
     return Session()
+
+
+def get_session() -> Iterator[SQLAlchemySession]:
+    """
+    Provide a database session scoped to a single request.
+
+    Intended for FastAPI's Depends, the session is closed and its connection
+    returned to the pool once the request has been handled.
+
+    Yields:
+        SQLAlchemySession: A new database session.
+    """
+    session = Session()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -32,6 +32,8 @@ class EnvironmentVariables(BaseSettings):
         DB_PASSWORD (str): The password for the database connection.
         DB_SSL_CA (Optional[str]): The SSL CA certificate for the database connection. Defaults to None.
         DB_SSL_VERIFY_CERT (Optional[bool]): Flag to enable or disable SSL certificate verification. Defaults to None.
+        CACHE_URL (Optional[str]): The Redis URL used for response caching. Caching is disabled when None.
+        CACHE_TTL (int): The number of seconds cached responses are kept. Defaults to 300.
 
     Methods:
         default_db_port(cls, v): Validates and converts the database port to an integer.
@@ -54,6 +56,8 @@ class EnvironmentVariables(BaseSettings):
     DB_PASSWORD: str
     DB_SSL_CA: Optional[str] = None
     DB_SSL_VERIFY_CERT: Optional[bool] = None
+    CACHE_URL: Optional[str] = None
+    CACHE_TTL: int = 300
 
     model_config = ConfigDict(env_file=".env", env_file_encoding="utf-8")
 
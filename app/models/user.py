@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, String, func
+from sqlalchemy import Column, DateTime, Index, Integer, String, func
 
 from .base import Base
 
@@ -7,6 +7,10 @@ class User(Base):
     """
     Database model for User.
 
+    The composite (column, id) indexes match the ORDER BY and keyset WHERE
+    emitted when listing users sorted by a timestamp. id, username and email
+    are already covered by their own indexes.
+
     Attributes:
         id (int): The primary key for the User table.
         username (str): The unique username of the user.
@@ -17,10 +21,14 @@ class User(Base):
     """
 
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_updated_at_id", "updated_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    username = Column(String, unique=True, index=True)
-    email = Column(String, unique=True, index=True)
+    username = Column(String, unique=True, index=True, nullable=False)
+    email = Column(String, unique=True, index=True, nullable=False)
     password = Column(String)
     created_at = Column(
         DateTime, nullable=False, default=func.current_timestamp()
@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import Optional
 
 from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
@@ -7,6 +8,27 @@ from app.helpers.database import db
 from app.models.user import User
 
 
+class SortField(str, Enum):
+    """
+    The fields the users listing can be sorted by, each backed by an index.
+    """
+
+    id = "id"
+    username = "username"
+    email = "email"
+    created_at = "created_at"
+    updated_at = "updated_at"
+
+
+class SortDir(str, Enum):
+    """
+    The sort orders of the users listing.
+    """
+
+    asc = "asc"
+    desc = "desc"
+
+
 class UserFindRequest(BaseModel):
     id: int
 
@@ -94,10 +116,7 @@ class UserUpdateRequest(BaseModel):
 
     @field_validator("username", mode="before")
     def check_name(cls, value):
-        if value is None:
-            return value
-
-        if not value.strip():
+        if value is None or not value.strip():
             raise ValueError("The name field is required")
 
         if len(value) < 3:
@@ -110,10 +129,7 @@ class UserUpdateRequest(BaseModel):
 
     @field_validator("email", mode="before")
     def check_email(cls, value):
-        if value is None:
-            return value
-
-        if not value.strip():
+        if value is None or not value.strip():
             raise ValueError("The email field is required")
 
         return value
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional, Union
 
 from pydantic import BaseModel, ConfigDict, field_serializer
 
@@ -49,17 +49,32 @@ class Pagination(BaseModel):
     total: int
 
 
+class CursorPagination(BaseModel):
+    """
+    Pydantic model representing cursor pagination information.
+
+    Attributes:
+        next_cursor (Optional[str]): The cursor of the next page, None on the last page.
+        prev_cursor (Optional[str]): The cursor of the previous page, None on the first page.
+        items_per_page (int): The number of items per page.
+    """
+
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    items_per_page: int
+
+
 class PaginatedUserResponse(BaseModel):
     """
     Pydantic model representing a paginated response for a list of users.
 
     Attributes:
         users (List[UserResponse]): The list of users.
-        pagination (Pagination): The pagination information.
+        pagination (Union[Pagination, CursorPagination]): The pagination information.
     """
 
     data: List[UserResponse]
-    meta: Pagination
+    meta: Union[Pagination, CursorPagination]
     status_code: int
 
 
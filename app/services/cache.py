@@ -0,0 +1,126 @@
+from functools import lru_cache
+from typing import Callable, Optional
+
+import redis
+
+from app.helpers.environment import env
+
+
+class CacheService:
+    """
+    A service class to cache serialized values in Redis.
+    Provides methods to get, set, remember and forget cached values.
+
+    Caching is disabled when no Redis client is given, and Redis errors are
+    treated as cache misses so an unavailable cache never fails a request.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None, ttl: int = 300):
+        """
+        Initializes the CacheService class.
+
+        Args:
+            client (Optional[redis.Redis]): The Redis client, or None to disable caching.
+            ttl (int): The number of seconds cached values are kept. Defaults to 300.
+        """
+        self.client = client
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Retrieves a cached value.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[str]: The cached value, or None on a miss.
+        """
+        if self.client is None:
+            return None
+        try:
+            return self.client.get(key)
+        except redis.RedisError:
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Caches a value for the configured TTL.
+
+        Args:
+            key (str): The cache key.
+            value (str): The value to cache.
+        """
+        if self.client is None:
+            return
+        try:
+            self.client.setex(key, self.ttl, value)
+        except redis.RedisError:
+            pass
+
+    def remember(self, key: str, callback: Callable[[], str]) -> str:
+        """
+        Retrieves a cached value, computing and caching it on a miss.
+
+        Args:
+            key (str): The cache key.
+            callback (Callable[[], str]): Computes the value on a cache miss.
+
+        Returns:
+            str: The cached or computed value.
+        """
+        value = self.get(key)
+        if value is None:
+            value = callback()
+            self.set(key, value)
+        return value
+
+    def forget(self, *keys: str) -> None:
+        """
+        Removes cached values.
+
+        Args:
+            *keys (str): The cache keys to remove.
+        """
+        if self.client is None or not keys:
+            return
+        try:
+            self.client.delete(*keys)
+        except redis.RedisError:
+            pass
+
+    def forget_pattern(self, pattern: str) -> None:
+        """
+        Removes every cached value whose key matches a glob-style pattern.
+
+        Args:
+            pattern (str): The key pattern, e.g. 'users:list:*'.
+        """
+        if self.client is None:
+            return
+        try:
+            keys = list(self.client.scan_iter(match=pattern))
+            if keys:
+                self.client.delete(*keys)
+        except redis.RedisError:
+            pass
+
+
+@lru_cache()
+def cache() -> CacheService:
+    """
+    Create and return the application CacheService.
+
+    The service connects to the Redis server at CACHE_URL and is disabled
+    when CACHE_URL is not set.
+
+    Returns:
+        CacheService: The shared cache service.
+    """
+    settings = env()
+    client = (
+        redis.Redis.from_url(settings.CACHE_URL, decode_responses=True)
+        if settings.CACHE_URL
+        else None
+    )
+    return CacheService(client=client, ttl=settings.CACHE_TTL)
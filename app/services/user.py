@@ -1,21 +1,51 @@
-from typing import List, Tuple
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple, Union
 
-from sqlalchemy import asc, desc
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, asc, desc, func, text, tuple_
+from sqlalchemy.orm import Query, Session, load_only
 
 from app.exceptions.user import (
     DuplicateUserError,
+    InvalidCursorError,
     InvalidSortFieldError,
     UserNotFoundError,
 )
 from app.models.user import User
-from app.requests.user import UserCreateRequest, UserUpdateRequest
+from app.requests.user import (
+    SortDir,
+    SortField,
+    UserCreateRequest,
+    UserUpdateRequest,
+)
 from app.responses.user import (
+    CursorPagination,
     UserCreateResponse,
     UserResponse,
     UserUpdateResponse,
 )
 
+RESPONSE_COLUMNS = (
+    User.id,
+    User.username,
+    User.email,
+    User.created_at,
+    User.updated_at,
+)
+"""
+The User columns needed to build a UserResponse.
+
+Listing queries load only these so the password hash is never fetched for
+rows that are only serialized.
+"""
+
+STREAM_BATCH_SIZE = 100
+"""
+The number of rows fetched at a time when streaming users.
+"""
+
 
 class UserService:
     def __init__(self, db: Session):
@@ -31,6 +61,9 @@ class UserService:
         """
         Retrieve a user by their ID.
 
+        The lookup goes through the session identity map first, so a user
+        already loaded by this session is returned without a query.
+
         Args:
             id (int): The ID of the user to retrieve.
 
@@ -40,7 +73,7 @@ class UserService:
         Raises:
             UserNotFoundError: If no user with the given ID is found.
         """
-        user = self.db.query(User).filter(User.id == id).first()
+        user = self.db.get(User, id)
         if not user:
             raise UserNotFoundError(f"User with ID {id} not found")
         return user
@@ -49,20 +82,221 @@ class UserService:
         """
         Converts a User object to a UserResponse object.
 
+        The fields come from the database already typed, so the response is
+        constructed without running Pydantic validation on every row.
+
         Args:
             user (User): The user object to convert.
 
         Returns:
             UserResponse: The converted user response object containing the user's id, username, email,
-                          created_at, and updated_at fields formatted as strings.
+                          created_at, and updated_at fields.
         """
-        return UserResponse(
+        return UserResponse.model_construct(
             id=user.id,
             username=user.username,
             email=user.email,
-            created_at=user.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            updated_at=user.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+    def _filtered_query(
+        self, email=None, username=None, start_date=None, end_date=None
+    ) -> Query:
+        """
+        Build a user query with the optional listing filters applied.
+
+        Args:
+            email (str, optional): Filter by email. Defaults to None.
+            username (str, optional): Filter by username. Defaults to None.
+            start_date (datetime, optional): Filter by start date (inclusive). Defaults to None.
+            end_date (datetime, optional): Filter by end date (inclusive). Defaults to None.
+
+        Returns:
+            Query: The filtered user query, loading only the RESPONSE_COLUMNS.
+        """
+        query = self.db.query(User).options(load_only(*RESPONSE_COLUMNS))
+
+        if username:
+            query = query.filter(User.username == username)
+        if email:
+            query = query.filter(User.email == email)
+        if start_date:
+            query = query.filter(User.created_at >= start_date)
+        if end_date:
+            query = query.filter(User.created_at <= end_date)
+
+        return query
+
+    def _sort_column(self, sort_type: SortDir, sort_by: SortField):
+        """
+        Validate the sort options and resolve the column to sort by.
+
+        Args:
+            sort_type (SortDir): The sort order, either 'asc' or 'desc'.
+            sort_by (SortField): The field to sort by.
+
+        Returns:
+            The User model column matching sort_by.
+
+        Raises:
+            ValueError: If the sort_type is not 'asc' or 'desc'.
+            InvalidSortFieldError: If the sort_by field is not a SortField.
+        """
+        if sort_type not in list(SortDir):
+            raise ValueError("Invalid sort type; must be 'asc' or 'desc'")
+
+        if sort_by not in list(SortField):
+            raise InvalidSortFieldError("Invalid sort field")
+
+        return getattr(User, SortField(sort_by).value)
+
+    def _estimated_total(self) -> Optional[int]:
+        """
+        Estimate the number of users from the PostgreSQL planner statistics.
+
+        Reading pg_class.reltuples is O(1), where COUNT(*) scans the whole
+        table, and stays within autovacuum's tolerance of the exact count.
+
+        Returns:
+            Optional[int]: The estimated number of users, or None on other databases
+                           or when the table has not been analyzed yet.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return None
+
+        estimate = self.db.execute(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = to_regclass(:table)"
+            ),
+            {"table": User.__tablename__},
+        ).scalar()
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    def _encode_cursor(self, user: User, sort_by: str, direction: str) -> str:
+        """
+        Encode the keyset position of a user into an opaque cursor.
+
+        Args:
+            user (User): The user marking the position.
+            sort_by (str): The field the listing is sorted by.
+            direction (str): Either 'next' or 'prev'.
+
+        Returns:
+            str: A URL-safe base64 encoded JSON cursor.
+        """
+        value = getattr(user, sort_by)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+
+        payload = json.dumps(
+            {
+                "sort_by": sort_by,
+                "value": value,
+                "id": user.id,
+                "direction": direction,
+            }
         )
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def _decode_cursor(self, cursor: str, sort_by: str, sort_column):
+        """
+        Decode a cursor produced by _encode_cursor.
+
+        Args:
+            cursor (str): The opaque cursor.
+            sort_by (str): The field the listing is sorted by.
+            sort_column: The User model column matching sort_by.
+
+        Returns:
+            tuple: The sort value, the user ID and the direction of the cursor.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed, holds a value of the wrong type
+                                for the sort field or was issued for another sort field.
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            value = payload["value"]
+            id = payload["id"]
+            direction = payload["direction"]
+            if type(id) is not int:
+                raise TypeError("Cursor id is not an integer")
+            if value is None:
+                raise TypeError("Cursor value is missing")
+            if isinstance(sort_column.type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif type(value) is not sort_column.type.python_type:
+                raise TypeError("Cursor value does not match the sort field")
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise InvalidCursorError("Invalid cursor")
+
+        if payload.get("sort_by") != sort_by or direction not in [
+            "next",
+            "prev",
+        ]:
+            raise InvalidCursorError("Invalid cursor")
+
+        return value, id, direction
+
+    def _counted_page(
+        self, query: Query, offset: int, items_per_page: int
+    ) -> Tuple[List[User], int]:
+        """
+        Fetch a page of users together with the exact total in one query.
+
+        Every row carries COUNT(*) OVER (), the number of rows matching the
+        query before LIMIT and OFFSET, so no separate COUNT is needed unless
+        the page is past the end.
+
+        Args:
+            query (Query): The filtered and ordered user query.
+            offset (int): The number of users to skip.
+            items_per_page (int): The number of users per page.
+
+        Returns:
+            Tuple[List[User], int]: The users on the page and the total number of users.
+        """
+        rows = (
+            query.add_columns(func.count().over().label("total"))
+            .offset(offset)
+            .limit(items_per_page)
+            .all()
+        )
+
+        if rows:
+            return [row[0] for row in rows], rows[0].total
+        return [], query.count() if offset else 0
+
+    def _estimated_page(
+        self, query: Query, offset: int, items_per_page: int
+    ) -> Tuple[List[User], int]:
+        """
+        Fetch a page of users and estimate the total, see _estimated_total().
+
+        One extra row is fetched to tell whether more pages follow. When none do,
+        the total is known from the page itself and nothing is estimated. A stale
+        estimate is never reported below the rows this page has seen.
+
+        Args:
+            query (Query): The unfiltered, ordered user query.
+            offset (int): The number of users to skip.
+            items_per_page (int): The number of users per page.
+
+        Returns:
+            Tuple[List[User], int]: The users on the page and the total number of users.
+        """
+        rows = query.offset(offset).limit(items_per_page + 1).all()
+        users = rows[:items_per_page]
+
+        if len(rows) <= items_per_page and (users or not offset):
+            return users, offset + len(users)
+
+        total = self._estimated_total()
+        if total is None:
+            return users, query.count()
+        return users, max(total, offset + len(rows) if rows else 0)
 
     def all(
         self,
@@ -78,11 +312,16 @@ class UserService:
         """
         Retrieve a paginated list of users with optional filtering and sorting.
 
+        Deprecated: OFFSET pagination gets slower the deeper the page, use cursor() instead.
+
+        The total comes back with the page from COUNT(*) OVER (), or is estimated
+        on PostgreSQL without filters, see _estimated_page().
+
         Args:
             page (int, optional): The page number to retrieve. Defaults to 1.
             items_per_page (int, optional): The number of items per page. Defaults to 10.
-            sort_type (str, optional): The sort order, either 'asc' or 'desc'. Defaults to "asc".
-            sort_by (str, optional): The field to sort by. Defaults to "id".
+            sort_type (SortDir, optional): The sort order, either 'asc' or 'desc'. Defaults to "asc".
+            sort_by (SortField, optional): The field to sort by. Defaults to "id".
             email (str, optional): Filter by email. Defaults to None.
             username (str, optional): Filter by username. Defaults to None.
             start_date (datetime, optional): Filter by start date (inclusive). Defaults to None.
@@ -98,31 +337,21 @@ class UserService:
 
         Raises:
             ValueError: If the sort_type is not 'asc' or 'desc'.
-            InvalidSortFieldError: If the sort_by field is not a valid attribute of the User model.
+            InvalidSortFieldError: If the sort_by field is not a SortField.
         """
-        if sort_type not in ["asc", "desc"]:
-            raise ValueError("Invalid sort type; must be 'asc' or 'desc'")
+        sort_column = self._sort_column(sort_type, sort_by)
 
         offset = (page - 1) * items_per_page
-        query = self.db.query(User)
-
-        if username:
-            query = query.filter(User.username == username)
-        if start_date:
-            query = query.filter(User.created_at >= start_date)
-        if end_date:
-            query = query.filter(User.created_at <= end_date)
-
-        if not hasattr(User, sort_by):
-            raise InvalidSortFieldError("Invalid sort field")
-
-        sort_column = getattr(User, sort_by)
+        query = self._filtered_query(email, username, start_date, end_date)
         query = query.order_by(
-            asc(sort_column) if sort_type == "asc" else desc(sort_column)
+            asc(sort_column) if sort_type == SortDir.asc else desc(sort_column)
         )
 
-        users = query.offset(offset).limit(items_per_page).all()
-        total = query.count()
+        filtered = any([email, username, start_date, end_date])
+        if not filtered and self.db.get_bind().dialect.name == "postgresql":
+            users, total = self._estimated_page(query, offset, items_per_page)
+        else:
+            users, total = self._counted_page(query, offset, items_per_page)
 
         users_response = [self._user_to_response(user) for user in users]
 
@@ -134,6 +363,227 @@ class UserService:
             min(offset + items_per_page, total),
         )
 
+    def _keyset_query(
+        self,
+        cursor,
+        sort_type,
+        sort_by,
+        email=None,
+        username=None,
+        start_date=None,
+        end_date=None,
+    ) -> Tuple[Query, str]:
+        """
+        Build the ordered user query positioned after (or before) a cursor.
+
+        Args:
+            cursor (str, optional): A next_cursor or prev_cursor, or None for the first page.
+            sort_type (SortDir): The sort order, either 'asc' or 'desc'.
+            sort_by (SortField): The field to sort by.
+            email (str, optional): Filter by email. Defaults to None.
+            username (str, optional): Filter by username. Defaults to None.
+            start_date (datetime, optional): Filter by start date (inclusive). Defaults to None.
+            end_date (datetime, optional): Filter by end date (inclusive). Defaults to None.
+
+        Returns:
+            Tuple[Query, str]: The query, to be limited by the caller, and the direction of
+                               the cursor, either 'next' or 'prev'. A 'prev' query is ordered
+                               backwards and its rows must be reversed.
+
+        Raises:
+            ValueError: If the sort_type is not 'asc' or 'desc'.
+            InvalidSortFieldError: If the sort_by field is not a SortField.
+            InvalidCursorError: If the cursor is malformed.
+        """
+        sort_column = self._sort_column(sort_type, sort_by)
+        query = self._filtered_query(email, username, start_date, end_date)
+
+        direction = "next"
+        ascending = sort_type == SortDir.asc
+        if cursor:
+            value, last_id, direction = self._decode_cursor(
+                cursor, sort_by, sort_column
+            )
+            ascending = ascending != (direction == "prev")
+            keyset = tuple_(sort_column, User.id)
+            query = query.filter(
+                keyset > (value, last_id)
+                if ascending
+                else keyset < (value, last_id)
+            )
+
+        order = asc if ascending else desc
+        return query.order_by(order(sort_column), order(User.id)), direction
+
+    def _keyset_cursors(
+        self,
+        first: User,
+        last: User,
+        has_more: bool,
+        cursor: Optional[str],
+        direction: str,
+        sort_by: str,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Compute the cursors of the pages around a non-empty page of users.
+
+        Args:
+            first (User): The first user of the page.
+            last (User): The last user of the page.
+            has_more (bool): Whether more users follow the page in the direction it was read.
+            cursor (Optional[str]): The cursor the page was read from.
+            direction (str): The direction of that cursor, either 'next' or 'prev'.
+            sort_by (str): The field the listing is sorted by.
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: The next and previous page cursors.
+        """
+        next_cursor = prev_cursor = None
+        if has_more or direction == "prev":
+            next_cursor = self._encode_cursor(last, sort_by, "next")
+        if (has_more and direction == "prev") or (
+            cursor and direction == "next"
+        ):
+            prev_cursor = self._encode_cursor(first, sort_by, "prev")
+        return next_cursor, prev_cursor
+
+    def cursor(
+        self,
+        cursor: Optional[str] = None,
+        items_per_page=10,
+        sort_type="asc",
+        sort_by="id",
+        email=None,
+        username=None,
+        start_date=None,
+        end_date=None,
+    ) -> Tuple[List[UserResponse], Optional[str], Optional[str]]:
+        """
+        Retrieve a list of users using keyset (cursor) pagination.
+
+        Rows are located with a WHERE on (sort_by, id) instead of an OFFSET,
+        so fetching any page costs the same regardless of its depth.
+
+        Args:
+            cursor (str, optional): A next_cursor or prev_cursor from a previous call. Defaults to None (first page).
+            items_per_page (int, optional): The number of items per page. Defaults to 10.
+            sort_type (SortDir, optional): The sort order, either 'asc' or 'desc'. Defaults to "asc".
+            sort_by (SortField, optional): The field to sort by. Defaults to "id".
+            email (str, optional): Filter by email. Defaults to None.
+            username (str, optional): Filter by username. Defaults to None.
+            start_date (datetime, optional): Filter by start date (inclusive). Defaults to None.
+            end_date (datetime, optional): Filter by end date (inclusive). Defaults to None.
+
+        Returns:
+            Tuple[List[UserResponse], Optional[str], Optional[str]]: A tuple containing:
+                - A list of UserResponse objects for the current page.
+                - The cursor of the next page, or None on the last page.
+                - The cursor of the previous page, or None on the first page.
+
+        Raises:
+            ValueError: If the sort_type is not 'asc' or 'desc'.
+            InvalidSortFieldError: If the sort_by field is not a SortField.
+            InvalidCursorError: If the cursor is malformed.
+        """
+        query, direction = self._keyset_query(
+            cursor, sort_type, sort_by, email, username, start_date, end_date
+        )
+        users = query.limit(items_per_page + 1).all()
+
+        has_more = len(users) > items_per_page
+        users = users[:items_per_page]
+        if direction == "prev":
+            users.reverse()
+
+        next_cursor, prev_cursor = (
+            self._keyset_cursors(
+                users[0], users[-1], has_more, cursor, direction, sort_by
+            )
+            if users
+            else (None, None)
+        )
+
+        users_response = [self._user_to_response(user) for user in users]
+
+        return users_response, next_cursor, prev_cursor
+
+    def stream(
+        self,
+        cursor: Optional[str] = None,
+        items_per_page=10,
+        sort_type="asc",
+        sort_by="id",
+        email=None,
+        username=None,
+        start_date=None,
+        end_date=None,
+    ) -> Iterator[Union[UserResponse, CursorPagination]]:
+        """
+        Stream a page of users using keyset (cursor) pagination.
+
+        The arguments are validated before this method returns. Rows are then
+        fetched from a server-side cursor in batches of STREAM_BATCH_SIZE, so
+        memory stays bounded however large the page is. A page read backwards
+        from a prev_cursor is still materialized to restore its order.
+
+        Args:
+            cursor (str, optional): A next_cursor or prev_cursor from a previous call. Defaults to None (first page).
+            items_per_page (int, optional): The number of items per page. Defaults to 10.
+            sort_type (SortDir, optional): The sort order, either 'asc' or 'desc'. Defaults to "asc".
+            sort_by (SortField, optional): The field to sort by. Defaults to "id".
+            email (str, optional): Filter by email. Defaults to None.
+            username (str, optional): Filter by username. Defaults to None.
+            start_date (datetime, optional): Filter by start date (inclusive). Defaults to None.
+            end_date (datetime, optional): Filter by end date (inclusive). Defaults to None.
+
+        Returns:
+            Iterator[Union[UserResponse, CursorPagination]]: The users of the page, followed by
+                the pagination information as the last item.
+
+        Raises:
+            ValueError: If the sort_type is not 'asc' or 'desc'.
+            InvalidSortFieldError: If the sort_by field is not a SortField.
+            InvalidCursorError: If the cursor is malformed.
+        """
+        query, direction = self._keyset_query(
+            cursor, sort_type, sort_by, email, username, start_date, end_date
+        )
+        query = query.limit(items_per_page + 1)
+
+        def generate():
+            if direction == "prev":
+                users = query.all()
+                has_more = len(users) > items_per_page
+                users = reversed(users[:items_per_page])
+            else:
+                users = query.yield_per(STREAM_BATCH_SIZE)
+                has_more = False
+
+            first = last = None
+            for count, user in enumerate(users):
+                if count == items_per_page:
+                    has_more = True
+                    break
+                if first is None:
+                    first = user
+                last = user
+                yield self._user_to_response(user)
+
+            next_cursor, prev_cursor = (
+                self._keyset_cursors(
+                    first, last, has_more, cursor, direction, sort_by
+                )
+                if first is not None
+                else (None, None)
+            )
+            yield CursorPagination(
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor,
+                items_per_page=items_per_page,
+            )
+
+        return generate()
+
     def save(self, user_request: UserCreateRequest) -> UserCreateResponse:
         """
         Saves a new user to the database.
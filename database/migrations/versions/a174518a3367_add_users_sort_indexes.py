@@ -0,0 +1,24 @@
+"""add users sort indexes
+
+Revision ID: a174518a3367
+Revises: be6c69c1a61a
+Create Date: 2026-10-14 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a174518a3367"
+down_revision = "be6c69c1a61a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"])
+    op.create_index("ix_users_updated_at_id", "users", ["updated_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_updated_at_id", table_name="users")
+    op.drop_index("ix_users_created_at_id", table_name="users")
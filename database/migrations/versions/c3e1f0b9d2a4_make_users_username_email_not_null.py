@@ -0,0 +1,55 @@
+"""make users username and email not null
+
+Revision ID: c3e1f0b9d2a4
+Revises: a174518a3367
+Create Date: 2026-10-14 18:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c3e1f0b9d2a4"
+down_revision = "a174518a3367"
+branch_labels = None
+depends_on = None
+
+users = sa.table(
+    "users",
+    sa.column("id", sa.Integer),
+    sa.column("username", sa.String),
+    sa.column("email", sa.String),
+)
+
+
+def upgrade() -> None:
+    placeholder = sa.literal("user_") + sa.cast(users.c.id, sa.String)
+    op.execute(
+        users.update()
+        .where(users.c.username.is_(None))
+        .values(username=placeholder)
+    )
+    op.execute(
+        users.update()
+        .where(users.c.email.is_(None))
+        .values(email=placeholder + sa.literal("@example.invalid"))
+    )
+
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.alter_column(
+            "username", existing_type=sa.String(50), nullable=False
+        )
+        batch_op.alter_column(
+            "email", existing_type=sa.String(50), nullable=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.alter_column(
+            "email", existing_type=sa.String(50), nullable=True
+        )
+        batch_op.alter_column(
+            "username", existing_type=sa.String(50), nullable=True
+        )
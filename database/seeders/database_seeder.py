@@ -1,3 +1,5 @@
+import argparse
+
 from . import user_seeder as UserSeeder
 
 
@@ -9,17 +11,26 @@ class DatabaseSeeder:
     such as the UserSeeder, to populate the database with initial data.
     """
 
-    def run(self):
+    def run(self, users=60):
         """
         Executes the run method of each individual seeder.
 
         This method calls the run method of the UserSeeder class, which
         is responsible for seeding user data into the database. Additional
         seeders can be added and executed in this method as needed.
+
+        Args:
+            users (int, optional): The number of users to seed. Defaults to 60.
         """
-        UserSeeder.run()
+        UserSeeder.run(count=users)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the database.")
+    parser.add_argument(
+        "--users", type=int, default=60, help="number of users to seed"
+    )
+    args = parser.parse_args()
+
     db = DatabaseSeeder()
-    db.run()
+    db.run(users=args.users)
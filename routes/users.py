@@ -1,31 +1,48 @@
 from datetime import date
-from typing import Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from typing import Iterator, Optional
+from urllib.parse import urlencode
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.exceptions.user import (
     DuplicateUserError,
+    InvalidCursorError,
     InvalidSortFieldError,
     UserNotFoundError,
 )
-from app.helpers.database import db
-from app.requests.user import UserCreateRequest, UserUpdateRequest
+from app.helpers.database import db, get_session
+from app.requests.user import (
+    SortDir,
+    SortField,
+    UserCreateRequest,
+    UserUpdateRequest,
+)
 from app.responses.user import (
     PaginatedUserResponse,
     SingleUserResponse,
     UserCreateResponse,
 )
+from app.services.cache import CacheService, cache
 from app.services.user import UserService
 
 
-def get_user_service(db: Session = Depends(db)) -> UserService:
+def get_user_service(db: Session = Depends(get_session)) -> UserService:
     """
-    Provides an instance of UserService with a database session.
+    Provides an instance of UserService with a request scoped database session.
 
     Args:
-        db (Session, optional): The database session dependency. Defaults to Depends(db).
+        db (Session, optional): The database session dependency. Defaults to Depends(get_session).
 
     Returns:
         UserService: An instance of UserService initialized with the provided database session.
@@ -36,91 +53,264 @@ def get_user_service(db: Session = Depends(db)) -> UserService:
 route = APIRouter(
     prefix="/api", tags=["Users"], responses={404: {"description": "Not found"}}
 )
-
-
-@route.get("/users", status_code=200, response_model=PaginatedUserResponse)
-async def get_users(
-    page: Optional[int] = Query(1, description="page number", gt=0),
+"""
+Defines the routing for the Users API.
+
+The handlers are plain functions rather than coroutines: UserService makes
+blocking SQLAlchemy calls, so FastAPI runs them in its threadpool and the
+event loop stays free to serve other requests.
+
+Responses are serialized once with model_dump_json() and returned as a JSON
+Response, which FastAPI passes through without validating the payload against
+response_model again; response_model only documents the schema.
+"""
+
+STREAM_THRESHOLD = 200
+"""
+Cursor pages with more items than this are streamed as NDJSON.
+"""
+
+
+@route.get(
+    "/users",
+    status_code=200,
+    response_model=PaginatedUserResponse,
+    responses={
+        200: {
+            "description": "A page of users, streamed as NDJSON for pages "
+            f"of more than {STREAM_THRESHOLD} items",
+            "content": {
+                "application/x-ndjson": {
+                    "schema": {
+                        "description": "One user per line, followed by a "
+                        "line with the pagination metadata",
+                        "oneOf": [
+                            {"$ref": "#/components/schemas/UserResponse"},
+                            {"$ref": "#/components/schemas/CursorPagination"},
+                        ],
+                    }
+                }
+            },
+        }
+    },
+)
+def get_users(
+    cursor: Optional[str] = Query(
+        None, description="next_cursor or prev_cursor of a previous page"
+    ),
+    page: Optional[int] = Query(
+        None,
+        description="page number (use cursor instead)",
+        gt=0,
+        deprecated=True,
+    ),
     items_per_page: Optional[int] = Query(
         10, description="items per page", gt=0
     ),
-    sort_type: Optional[str] = Query(
-        "asc", description="sort type (asc or desc)"
+    sort_type: SortDir = Query(
+        SortDir.asc, description="sort type (asc or desc)"
     ),
-    sort_by: Optional[str] = Query("id", description="sort by field"),
+    sort_by: SortField = Query(SortField.id, description="sort by field"),
     username: Optional[str] = Query(None, description="username filter"),
     email: Optional[str] = Query(None, description="email filter"),
     start_date: Optional[date] = Query(None, description="start date filter"),
     end_date: Optional[date] = Query(None, description="end date filter"),
     user_service: UserService = Depends(get_user_service),
+    cache_service: CacheService = Depends(cache),
 ):
     """
+    Pages of more than STREAM_THRESHOLD items are streamed as NDJSON instead,
+    one user per line followed by a line with the pagination metadata.
+
     Args:
-        page (Optional[int]): Page number for pagination (default is 1).
+        cursor (Optional[str]): Cursor of the page to retrieve (default is the first page).
+        page (Optional[int]): Deprecated page number for OFFSET pagination.
         items_per_page (Optional[int]): Number of items per page (default is 10).
-        sort_type (Optional[str]): Sort type, either 'asc' or 'desc' (default is 'asc').
-        sort_by (Optional[str]): Field to sort by (default is 'id').
+        sort_type (SortDir): Sort type, either 'asc' or 'desc' (default is 'asc').
+        sort_by (SortField): Field to sort by (default is 'id').
         username (Optional[str]): Filter by username.
         email (Optional[str]): Filter by email.
         start_date (Optional[date]): Filter by start date.
         end_date (Optional[date]): Filter by end date.
         user_service (UserService): Dependency injection for user service.
+        cache_service (CacheService): Dependency injection for the response cache.
 
     Returns:
-        dict: A dictionary containing the list of users, pagination metadata, and status code.
+        Response: The JSON list of users, pagination metadata, and status code.
 
     Raises:
-        HTTPException: If an invalid sort field is provided (status code 400).
+        HTTPException: If an invalid sort field or cursor is provided (status code 400).
         HTTPException: If an unexpected error occurs (status code 500).
     """
+    filters = {
+        "items_per_page": items_per_page,
+        "sort_type": sort_type,
+        "sort_by": sort_by,
+        "start_date": start_date,
+        "end_date": end_date,
+        "username": username,
+        "email": email,
+    }
+
+    cache_key = "users:list:" + urlencode(
+        {
+            "cursor": cursor,
+            "page": page,
+            **filters,
+            "sort_type": sort_type.value,
+            "sort_by": sort_by.value,
+        }
+    )
+
     try:
-        items, total, last_page, first_item, last_item = user_service.all(
-            page=page,
-            items_per_page=items_per_page,
-            sort_type=sort_type,
-            sort_by=sort_by,
-            start_date=start_date,
-            end_date=end_date,
-            username=username,
-            email=email,
+        if page is None and items_per_page > STREAM_THRESHOLD:
+            return StreamingResponse(
+                _stream_users(cursor, filters),
+                media_type="application/x-ndjson",
+            )
+
+        body = cache_service.remember(
+            cache_key,
+            lambda: PaginatedUserResponse(
+                **(
+                    _get_users_by_page(user_service, page, filters)
+                    if page is not None
+                    else _get_users_by_cursor(user_service, cursor, filters)
+                )
+            ).model_dump_json(),
         )
+        return Response(content=body, media_type="application/json")
+    except (InvalidSortFieldError, InvalidCursorError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
+
+
+def _stream_users(cursor: Optional[str], filters: dict) -> Iterator[str]:
+    """
+    Stream the users listing as NDJSON lines from a session of its own.
+
+    The response body is sent after the request's session has been closed,
+    so the stream opens a session that is closed once streaming ends. The
+    cursor and sort options are validated before this function returns.
+
+    Args:
+        cursor (Optional[str]): Cursor of the page to retrieve.
+        filters (dict): The sorting and filtering query parameters.
+
+    Returns:
+        Iterator[str]: One JSON document per line.
+
+    Raises:
+        InvalidSortFieldError: If the sort_by field is not a SortField.
+        InvalidCursorError: If the cursor is malformed.
+    """
+    session = db()
+    try:
+        items = UserService(db=session).stream(cursor=cursor, **filters)
+    except Exception:
+        session.close()
+        raise
+
+    def generate():
+        try:
+            for item in items:
+                yield item.model_dump_json() + "\n"
+        finally:
+            session.close()
 
-        if not items:
-            return {
-                "data": [],
-                "meta": {
-                    "current_page": 0,
-                    "last_page": 0,
-                    "first_item": 0,
-                    "last_item": 0,
-                    "items_per_page": 0,
-                    "total": 0,
-                },
-                "status_code": 404,
-            }
+    return generate()
 
+
+def _get_users_by_cursor(
+    user_service: UserService, cursor: Optional[str], filters: dict
+):
+    """
+    Build the users listing using keyset (cursor) pagination.
+
+    Args:
+        user_service (UserService): The user service.
+        cursor (Optional[str]): Cursor of the page to retrieve.
+        filters (dict): The sorting and filtering query parameters.
+
+    Returns:
+        dict: A dictionary containing the list of users, pagination metadata, and status code.
+    """
+    items, next_cursor, prev_cursor = user_service.cursor(
+        cursor=cursor, **filters
+    )
+
+    if not items:
         return {
-            "data": items,
+            "data": [],
             "meta": {
-                "current_page": page,
-                "last_page": last_page,
-                "first_item": first_item,
-                "last_item": last_item,
-                "items_per_page": items_per_page,
-                "total": total,
+                "next_cursor": None,
+                "prev_cursor": None,
+                "items_per_page": 0,
             },
-            "status_code": 200,
+            "status_code": 404,
         }
-    except InvalidSortFieldError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
+
+    return {
+        "data": items,
+        "meta": {
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "items_per_page": filters["items_per_page"],
+        },
+        "status_code": 200,
+    }
+
+
+def _get_users_by_page(user_service: UserService, page: int, filters: dict):
+    """
+    Build the users listing using the deprecated OFFSET pagination.
+
+    Args:
+        user_service (UserService): The user service.
+        page (int): Page number for pagination.
+        filters (dict): The sorting and filtering query parameters.
+
+    Returns:
+        dict: A dictionary containing the list of users, pagination metadata, and status code.
+    """
+    items, total, last_page, first_item, last_item = user_service.all(
+        page=page, **filters
+    )
+
+    if not items:
+        return {
+            "data": [],
+            "meta": {
+                "current_page": 0,
+                "last_page": 0,
+                "first_item": 0,
+                "last_item": 0,
+                "items_per_page": 0,
+                "total": 0,
+            },
+            "status_code": 404,
+        }
+
+    return {
+        "data": items,
+        "meta": {
+            "current_page": page,
+            "last_page": last_page,
+            "first_item": first_item,
+            "last_item": last_item,
+            "items_per_page": filters["items_per_page"],
+            "total": total,
+        },
+        "status_code": 200,
+    }
 
 
 @route.get("/users/{id}", status_code=200, response_model=SingleUserResponse)
-async def get_user(
+def get_user(
     id: int = Path(..., title="The ID of the user to get", gt=0),
     user_service: UserService = Depends(get_user_service),
+    cache_service: CacheService = Depends(cache),
 ):
     """
     Retrieve a user by ID.
@@ -128,16 +318,22 @@ async def get_user(
     Args:
         id (int): The ID of the user to get. Must be greater than 0.
         user_service (UserService): Dependency injection for the user service.
+        cache_service (CacheService): Dependency injection for the response cache.
 
     Returns:
-        dict: A dictionary containing the user data and status code.
+        Response: The JSON user data and status code.
 
     Raises:
         HTTPException: If the user is not found (404), validation fails (422), or an unexpected error occurs (500).
     """
     try:
-        user = user_service.find(id)
-        return {"data": user, "status_code": 200}
+        body = cache_service.remember(
+            f"users:id:{id}",
+            lambda: SingleUserResponse(
+                data=user_service.find(id), status_code=200
+            ).model_dump_json(),
+        )
+        return Response(content=body, media_type="application/json")
     except UserNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValidationError as e:
@@ -147,9 +343,10 @@ async def get_user(
 
 
 @route.post("/users/{id}", status_code=201, response_model=UserCreateResponse)
-async def create_user(
+def create_user(
     user_request: UserCreateRequest,
     user_service: UserService = Depends(get_user_service),
+    cache_service: CacheService = Depends(cache),
 ):
     """
     Create a new user.
@@ -157,16 +354,22 @@ async def create_user(
     Args:
         user_request (UserCreateRequest): The request body containing user creation details.
         user_service (UserService): The UserService dependency for handling user operations.
+        cache_service (CacheService): The response cache to invalidate.
 
     Returns:
-        UserCreateResponse: The response data of the created user.
+        Response: The JSON response data of the created user.
 
     Raises:
         HTTPException: If a user with the same email already exists.
     """
     try:
         created_user = user_service.save(user_request)
-        return created_user
+        cache_service.forget_pattern("users:list:*")
+        return Response(
+            content=created_user.model_dump_json(),
+            status_code=status.HTTP_201_CREATED,
+            media_type="application/json",
+        )
     except DuplicateUserError:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -180,10 +383,11 @@ async def create_user(
 
 
 @route.put("/users/{id}", status_code=200, response_model=SingleUserResponse)
-async def update_user(
+def update_user(
     user_request: UserUpdateRequest,
     id: int = Path(..., title="The ID of the user to update", gt=0),
     user_service: UserService = Depends(get_user_service),
+    cache_service: CacheService = Depends(cache),
 ):
     """
     Update an existing user.
@@ -192,16 +396,24 @@ async def update_user(
         user_request (UserUpdateRequest): The request object containing user update information.
         id (int): The ID of the user to update. Must be greater than 0.
         user_service (UserService): The user service dependency.
+        cache_service (CacheService): The response cache to invalidate.
 
     Returns:
-        dict: A dictionary containing the updated user data and status code.
+        Response: The JSON updated user data and status code.
 
     Raises:
         HTTPException: If the user is not found (404) or any other exception occurs (500).
     """
     try:
         updated_user = user_service.update(id, user_request)
-        return {"data": updated_user, "status_code": 200}
+        cache_service.forget(f"users:id:{id}")
+        cache_service.forget_pattern("users:list:*")
+        return Response(
+            content=SingleUserResponse(
+                data=updated_user, status_code=200
+            ).model_dump_json(),
+            media_type="application/json",
+        )
     except UserNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -209,9 +421,10 @@ async def update_user(
 
 
 @route.delete("/users/{id}", status_code=200, response_model=SingleUserResponse)
-async def delete_user(
+def delete_user(
     id: int = Path(..., title="The ID of the user to delete", gt=0),
     user_service: UserService = Depends(get_user_service),
+    cache_service: CacheService = Depends(cache),
 ):
     """
     Delete a user by ID.
@@ -219,9 +432,10 @@ async def delete_user(
     Args:
         id (int): The ID of the user to delete. Must be greater than 0.
         user_service (UserService): The user service dependency.
+        cache_service (CacheService): The response cache to invalidate.
 
     Returns:
-        dict: A dictionary containing the deleted user data and status code 200.
+        Response: The JSON deleted user data and status code 200.
 
     Raises:
         HTTPException: If the user is not found (status code 404).
@@ -229,7 +443,14 @@ async def delete_user(
     """
     try:
         user = user_service.delete(id)
-        return {"data": user, "status_code": 200}
+        cache_service.forget(f"users:id:{id}")
+        cache_service.forget_pattern("users:list:*")
+        return Response(
+            content=SingleUserResponse(
+                data=user, status_code=200
+            ).model_dump_json(),
+            media_type="application/json",
+        )
     except UserNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -237,11 +458,12 @@ async def delete_user(
 
 
 @route.delete("/users/{ids}/bulk", status_code=status.HTTP_200_OK)
-async def batch_delete_users(
+def batch_delete_users(
     ids: str = Path(
         ..., description="Comma-separated list of user IDs to delete"
     ),
     user_service: UserService = Depends(get_user_service),
+    cache_service: CacheService = Depends(cache),
 ):
     """
     Batch delete multiple users by their IDs from the URL path.
@@ -249,6 +471,7 @@ async def batch_delete_users(
     Args:
         user_ids (str): Comma-separated list of user IDs.
         user_service (UserService): UserService instance for handling user operations.
+        cache_service (CacheService): The response cache to invalidate.
 
     Returns:
         dict: A dictionary with a message indicating the deletion status.
@@ -260,6 +483,8 @@ async def batch_delete_users(
         user_id_list = [int(user_id.strip()) for user_id in ids.split(",")]
 
         deleted_user_ids = user_service.bulk_delete(user_id_list)
+        cache_service.forget(*[f"users:id:{id}" for id in deleted_user_ids])
+        cache_service.forget_pattern("users:list:*")
         return {"message": f"Deleted users with IDs: {deleted_user_ids}"}
     except UserNotFoundError:
         raise HTTPException(
@@ -2,14 +2,24 @@ import os
 
 import pytest
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-from app.helpers.database import db
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import (
+    make_transient,
+    make_transient_to_detached,
+    raiseload,
+    sessionmaker,
+)
+from sqlalchemy.pool import StaticPool
+
+from app.helpers.database import Session, db, engine_options, get_session
 from app.models.base import Base
 from app.models.user import User
+from app.services.cache import CacheService, cache
+from public.main import app
 
 load_dotenv(dotenv_path=".env_testing")
+os.environ.setdefault("TESTING", "1")
 
 get_db = db()
 
@@ -17,7 +27,9 @@ get_db = db()
 def construct_database_url():
     db_type = os.environ.get("DB_TYPE", "sqlite")
     db_name = "spartan.db"
-    if db_type == "sqlite":
+    if db_type == "sqlite" and os.environ.get("TESTING") == "1":
+        return "sqlite:///file:spartantest?mode=memory&cache=shared&uri=true"
+    elif db_type == "sqlite":
         return f"sqlite:///./database/{db_name}"
     else:
         db_host = os.getenv("DB_HOST", "localhost")
@@ -36,25 +48,161 @@ def construct_database_url():
     raise ValueError(f"Unsupported database type: {db_type}")
 
 
-@pytest.fixture(scope="module")
-def test_db_session():
-    TEST_DATABASE_URL = construct_database_url()
+def raise_on_lazy_load(orm_execute_state):
+    """
+    Make relationships that were not eagerly loaded raise instead of lazy
+    loading, so a test fails as soon as code under test introduces an N+1.
+    """
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            raiseload("*")
+        )
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Trade durability for speed when the SQLite test database is on disk
+    (TESTING=0), where every test commit would otherwise wait on an fsync.
+    The in-memory database used by default has no journal to tune.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+def disable_pysqlite_transactions(dbapi_connection, connection_record):
+    """
+    Leave transactions to SQLAlchemy, pysqlite would otherwise defer BEGIN
+    and commit the outer transaction on the first RELEASE SAVEPOINT.
+    """
+    dbapi_connection.isolation_level = None
+
+
+def begin_sqlite_transaction(connection):
+    """Emit the BEGIN that pysqlite no longer issues by itself."""
+    connection.exec_driver_sql("BEGIN")
+
 
-    engine = create_engine(TEST_DATABASE_URL)
-    Base.metadata.create_all(bind=engine)
-    TestingSessionLocal = sessionmaker(
-        autocommit=False, autoflush=False, bind=engine
+TEST_DATABASE_URL = construct_database_url()
+TEST_DATABASE_TYPE = os.environ.get("DB_TYPE", "sqlite")
+
+if TEST_DATABASE_TYPE == "sqlite":
+    # A single connection keeps the in-memory database alive and shared
+    ENGINE = create_engine(
+        TEST_DATABASE_URL,
+        poolclass=StaticPool,
+        **engine_options(TEST_DATABASE_TYPE),
+    )
+    if "mode=memory" not in TEST_DATABASE_URL:
+        event.listen(ENGINE, "connect", set_sqlite_pragmas)
+    event.listen(ENGINE, "connect", disable_pysqlite_transactions)
+    event.listen(ENGINE, "begin", begin_sqlite_transaction)
+else:
+    ENGINE = create_engine(
+        TEST_DATABASE_URL, **engine_options(TEST_DATABASE_TYPE)
     )
 
-    db = TestingSessionLocal()
+TestingSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=ENGINE
+)
+
+
+@pytest.fixture(scope="session")
+def test_connection():
+    """
+    The connection all test sessions share, for the whole test run.
+
+    The run happens inside one outer transaction, so sessions joining it
+    commit SAVEPOINTs only and tests can nest SAVEPOINTs of their own.
+    """
+    Base.metadata.create_all(bind=ENGINE)
+
+    connection = ENGINE.connect()
+    transaction = connection.begin()
+
+    # Sessions the application opens itself, e.g. in request validators,
+    # read through the same transaction and never end it
+    session_config = dict(Session.kw)
+    Session.configure(bind=connection, join_transaction_mode="rollback_only")
+
+    yield connection
+
+    Session.kw.clear()
+    Session.kw.update(session_config)
+
+    transaction.rollback()
+    connection.close()
+    Base.metadata.drop_all(bind=ENGINE)
+
+
+@pytest.fixture(scope="session")
+def test_db_session(test_connection):
+    db = TestingSessionLocal(
+        bind=test_connection, join_transaction_mode="create_savepoint"
+    )
+    event.listen(db, "do_orm_execute", raise_on_lazy_load)
 
     yield db
 
     db.close()
-    Base.metadata.drop_all(bind=engine)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
+def client(test_db_session):
+    """
+    A TestClient for the application, started once for the whole test run.
+
+    Routes use test_db_session instead of opening their own sessions, and
+    response caching is disabled.
+    """
+    app.dependency_overrides[get_session] = lambda: test_db_session
+    app.dependency_overrides[cache] = lambda: CacheService()
+
+    with TestClient(app) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def clean_users(test_connection, test_db_session):
+    """
+    test_db_session, with the changes made during the test rolled back.
+
+    The test runs inside a SAVEPOINT of its own and the session's commits
+    only release SAVEPOINTs nested in it, so tests can add users without
+    deleting them afterwards. Routes called through the client use the
+    same session.
+    """
+    test_db_session.commit()
+    savepoint = test_connection.begin_nested()
+    existing = set(test_db_session)
+
+    yield test_db_session
+
+    test_db_session.rollback()
+    savepoint.rollback()
+
+    # Objects loaded before the test, e.g. test_data, stay attached, even if
+    # the test deleted them, and are reloaded on first access; the ones the
+    # test added are let go
+    for instance in set(test_db_session) - existing:
+        test_db_session.expunge(instance)
+    for instance in existing - set(test_db_session):
+        make_transient(instance)
+        make_transient_to_detached(instance)
+        test_db_session.add(instance)
+    test_db_session.expire_all()
+
+
+@pytest.fixture(scope="session")
 def test_data(test_db_session):
     users = [
         User(
@@ -65,12 +213,7 @@ def test_data(test_db_session):
         for i in range(1, 6)
     ]
 
-    for user in users:
-        test_db_session.add(user)
+    test_db_session.add_all(users)
     test_db_session.commit()
 
-    yield users
-
-    for user in users:
-        test_db_session.delete(user)
-    test_db_session.commit()
+    return users
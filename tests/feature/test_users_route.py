@@ -0,0 +1,345 @@
+import base64
+import json
+from datetime import datetime
+from fnmatch import fnmatch
+
+import pytest
+
+from app.helpers.database import db
+from app.models.user import User
+from app.services.cache import CacheService, cache
+from public.main import app
+
+DATE_FILTER = {"start_date": "2020-03-01", "end_date": "2020-03-31"}
+
+
+class FakeRedis:
+    """An in-memory stand-in for the Redis commands CacheService uses."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def scan_iter(self, match):
+        return [key for key in list(self.values) if fnmatch(key, match)]
+
+
+@pytest.fixture
+def fake_redis(client):
+    """Fixture to enable response caching on a FakeRedis for the test."""
+    fake = FakeRedis()
+    app.dependency_overrides[cache] = lambda: CacheService(client=fake)
+
+    yield fake
+
+    app.dependency_overrides[cache] = lambda: CacheService()
+
+
+def list_keys(fake_redis):
+    return [key for key in fake_redis.values if key.startswith("users:list:")]
+
+
+@pytest.fixture
+def route_users(clean_users):
+    """Fixture to create users in a date range not shared with other tests."""
+    users = [
+        User(
+            username=f"routeuser{i}",
+            email=f"routeuser{i}@example.com",
+            password="password123",
+            created_at=datetime(2020, 3, i),
+            updated_at=datetime(2020, 3, i),
+        )
+        for i in range(1, 4)
+    ]
+    clean_users.add_all(users)
+    clean_users.commit()
+
+    return users
+
+
+def test_get_users_with_cursor(client, route_users):
+    response = client.get(
+        "/api/users", params={"items_per_page": 2, **DATE_FILTER}
+    )
+    body = response.json()
+
+    assert response.status_code == 200
+    assert [user["username"] for user in body["data"]] == [
+        "routeuser1",
+        "routeuser2",
+    ]
+    assert body["meta"]["prev_cursor"] is None
+    assert body["meta"]["items_per_page"] == 2
+
+    response = client.get(
+        "/api/users",
+        params={
+            "items_per_page": 2,
+            "cursor": body["meta"]["next_cursor"],
+            **DATE_FILTER,
+        },
+    )
+    body = response.json()
+
+    assert [user["username"] for user in body["data"]] == ["routeuser3"]
+    assert body["meta"]["next_cursor"] is None
+    assert body["meta"]["prev_cursor"] is not None
+
+
+def test_get_users_with_page(client, route_users):
+    response = client.get(
+        "/api/users", params={"page": 2, "items_per_page": 2, **DATE_FILTER}
+    )
+    body = response.json()
+
+    assert response.status_code == 200
+    assert [user["username"] for user in body["data"]] == ["routeuser3"]
+    assert body["meta"]["current_page"] == 2
+    assert body["meta"]["last_page"] == 2
+    assert body["meta"]["total"] == 3
+
+
+def test_get_users_invalid_cursor(client):
+    response = client.get("/api/users", params={"cursor": "invalid"})
+
+    assert response.status_code == 400
+
+
+def test_get_users_tampered_cursor(client):
+    cursor = base64.urlsafe_b64encode(
+        json.dumps(
+            {"sort_by": "id", "value": {"a": 1}, "id": 1, "direction": "next"}
+        ).encode()
+    ).decode()
+
+    response = client.get("/api/users", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert "SQL" not in response.json()["detail"]
+
+
+def test_get_users_invalid_sort_field(client):
+    response = client.get("/api/users", params={"sort_by": "password"})
+
+    assert response.status_code == 422
+
+
+def test_get_user(client, route_users):
+    response = client.get(f"/api/users/{route_users[0].id}")
+    body = response.json()
+
+    assert response.status_code == 200
+    assert body["data"]["username"] == "routeuser1"
+    assert body["data"]["created_at"] == "2020-03-01 00:00:00"
+
+
+def test_get_user_not_found(client):
+    response = client.get("/api/users/999999")
+
+    assert response.status_code == 404
+
+
+def test_get_users_streams_large_pages(client, route_users):
+    response = client.get(
+        "/api/users", params={"items_per_page": 201, **DATE_FILTER}
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [line["username"] for line in lines[:-1]] == [
+        "routeuser1",
+        "routeuser2",
+        "routeuser3",
+    ]
+    assert lines[-1] == {
+        "next_cursor": None,
+        "prev_cursor": None,
+        "items_per_page": 201,
+    }
+
+
+def test_get_users_streams_from_its_own_session(
+    client, test_db_session, route_users, mocker
+):
+    sessions = []
+
+    def open_session():
+        session = db()
+        mocker.spy(session, "close")
+        sessions.append(session)
+        return session
+
+    mocker.patch("routes.users.db", side_effect=open_session)
+    test_db_close = mocker.spy(test_db_session, "close")
+
+    response = client.get(
+        "/api/users", params={"items_per_page": 201, **DATE_FILTER}
+    )
+
+    assert len(response.text.splitlines()) == 4
+    assert len(sessions) == 1
+    sessions[0].close.assert_called_once()
+    test_db_close.assert_not_called()
+
+    response = client.get(
+        "/api/users", params={"items_per_page": 201, "cursor": "invalid"}
+    )
+
+    assert response.status_code == 400
+    sessions[1].close.assert_called_once()
+
+
+def test_create_user(clean_users, client):
+    payload = {
+        "username": "newrouteuser",
+        "email": "newrouteuser@example.com",
+        "password": "password123",
+    }
+
+    response = client.post("/api/users/0", json=payload)
+
+    assert response.status_code == 201
+    assert response.json()["username"] == "newrouteuser"
+
+    response = client.post("/api/users/0", json=payload)
+
+    assert response.status_code == 422
+
+
+def test_get_user_is_served_from_cache(
+    client, clean_users, fake_redis, route_users
+):
+    user = route_users[0]
+    client.get(f"/api/users/{user.id}")
+
+    assert f"users:id:{user.id}" in fake_redis.values
+
+    user.username = "uncacheduser"
+    clean_users.commit()
+    response = client.get(f"/api/users/{user.id}")
+
+    assert response.json()["data"]["username"] == "routeuser1"
+
+
+def test_get_users_is_served_from_cache(
+    client, clean_users, fake_redis, route_users
+):
+    client.get("/api/users", params=DATE_FILTER)
+
+    assert len(list_keys(fake_redis)) == 1
+
+    route_users[0].username = "uncacheduser"
+    clean_users.commit()
+    response = client.get("/api/users", params=DATE_FILTER)
+
+    assert response.json()["data"][0]["username"] == "routeuser1"
+
+
+def test_update_user_forgets_cached_responses(client, fake_redis, route_users):
+    user = route_users[0]
+    client.get(f"/api/users/{user.id}")
+    client.get("/api/users", params=DATE_FILTER)
+
+    response = client.put(
+        f"/api/users/{user.id}", json={"username": "renameduser"}
+    )
+
+    assert response.status_code == 200
+    assert f"users:id:{user.id}" not in fake_redis.values
+    assert list_keys(fake_redis) == []
+
+    response = client.get(f"/api/users/{user.id}")
+
+    assert response.json()["data"]["username"] == "renameduser"
+
+
+def test_update_user_rejects_null_username(client, route_users):
+    response = client.put(
+        f"/api/users/{route_users[0].id}", json={"username": None}
+    )
+
+    assert response.status_code == 422
+
+
+def test_delete_user_forgets_cached_responses(client, fake_redis, route_users):
+    user = route_users[0]
+    client.get(f"/api/users/{user.id}")
+    client.get("/api/users", params=DATE_FILTER)
+
+    response = client.delete(f"/api/users/{user.id}")
+
+    assert response.status_code == 200
+    assert f"users:id:{user.id}" not in fake_redis.values
+    assert list_keys(fake_redis) == []
+    assert client.get(f"/api/users/{user.id}").status_code == 404
+
+
+def test_bulk_delete_users_forgets_cached_responses(
+    client, fake_redis, route_users
+):
+    ids = [user.id for user in route_users[:2]]
+    for id in ids:
+        client.get(f"/api/users/{id}")
+    client.get("/api/users", params=DATE_FILTER)
+
+    response = client.delete(f"/api/users/{ids[0]},{ids[1]}/bulk")
+
+    assert response.status_code == 200
+    assert fake_redis.values == {}
+
+
+def test_create_user_forgets_cached_lists(client, clean_users, fake_redis):
+    client.get("/api/users")
+
+    response = client.post(
+        "/api/users/0",
+        json={
+            "username": "cacheduser",
+            "email": "cacheduser@example.com",
+            "password": "password123",
+        },
+    )
+
+    assert response.status_code == 201
+    assert list_keys(fake_redis) == []
+
+
+def test_delete_test_data_user(clean_users, client, test_data):
+    test_data[1].username = "renamedtestuser"
+    clean_users.commit()
+
+    response = client.delete(f"/api/users/{test_data[0].id}")
+
+    assert response.status_code == 200
+
+
+def test_test_data_outlives_clean_users(test_db_session, test_data):
+    """Runs after test_delete_test_data_user, whose changes are rolled back."""
+    assert [user.username for user in test_data[:2]] == [
+        "testuser1",
+        "testuser2",
+    ]
+    assert test_db_session.get(User, test_data[0].id) is test_data[0]
+
+
+def test_get_users_documents_ndjson_response(client):
+    schema = client.get("/openapi.json").json()
+    content = schema["paths"]["/api/users"]["get"]["responses"]["200"][
+        "content"
+    ]
+
+    assert set(content) == {"application/json", "application/x-ndjson"}
+    assert {"UserResponse", "CursorPagination"} <= set(
+        schema["components"]["schemas"]
+    )
@@ -0,0 +1,68 @@
+import pytest
+import redis
+
+from app.services.cache import CacheService
+
+
+@pytest.fixture
+def mock_redis(mocker):
+    """Mock the Redis client."""
+    return mocker.MagicMock(spec=redis.Redis)
+
+
+@pytest.fixture
+def cache_service(mock_redis):
+    """Create an instance of CacheService with a mocked Redis client."""
+    return CacheService(client=mock_redis, ttl=60)
+
+
+def test_get_hit(cache_service, mock_redis):
+    mock_redis.get.return_value = '{"id": 1}'
+    assert cache_service.get("users:id:1") == '{"id": 1}'
+    mock_redis.get.assert_called_once_with("users:id:1")
+
+
+def test_set_uses_ttl(cache_service, mock_redis):
+    cache_service.set("users:id:1", '{"id": 1}')
+    mock_redis.setex.assert_called_once_with("users:id:1", 60, '{"id": 1}')
+
+
+def test_remember_miss(cache_service, mock_redis):
+    mock_redis.get.return_value = None
+    value = cache_service.remember("users:id:1", lambda: '{"id": 1}')
+
+    assert value == '{"id": 1}'
+    mock_redis.setex.assert_called_once_with("users:id:1", 60, '{"id": 1}')
+
+
+def test_remember_hit(cache_service, mock_redis, mocker):
+    mock_redis.get.return_value = '{"id": 1}'
+    callback = mocker.Mock()
+
+    assert cache_service.remember("users:id:1", callback) == '{"id": 1}'
+    callback.assert_not_called()
+    mock_redis.setex.assert_not_called()
+
+
+def test_forget_pattern(cache_service, mock_redis):
+    mock_redis.scan_iter.return_value = iter(["users:list:a", "users:list:b"])
+    cache_service.forget_pattern("users:list:*")
+
+    mock_redis.scan_iter.assert_called_once_with(match="users:list:*")
+    mock_redis.delete.assert_called_once_with("users:list:a", "users:list:b")
+
+
+def test_redis_error_is_a_miss(cache_service, mock_redis):
+    mock_redis.get.side_effect = redis.ConnectionError()
+    mock_redis.setex.side_effect = redis.ConnectionError()
+
+    assert cache_service.remember("users:id:1", lambda: "value") == "value"
+
+
+def test_disabled_cache():
+    cache_service = CacheService()
+
+    assert cache_service.get("users:id:1") is None
+    assert cache_service.remember("users:id:1", lambda: "value") == "value"
+    cache_service.forget("users:id:1")
+    cache_service.forget_pattern("users:list:*")
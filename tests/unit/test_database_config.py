@@ -1,7 +1,12 @@
 import pytest
+from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
-from app.helpers.database import create_database_engine
+from app.helpers.database import (
+    create_database_engine,
+    engine_options,
+    get_session,
+)
 
 
 @pytest.fixture
@@ -98,3 +103,42 @@ def test_create_database_engine_mysql(mock_settings_mysql):
     """
     engine = create_database_engine()
     assert isinstance(engine, Engine)
+
+
+def test_engine_options_psql():
+    """
+    Given: A PostgreSQL database type.
+    When: Building the engine options.
+    Then: The pool should be sized and pre-ping its connections.
+    """
+    options = engine_options("psql")
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 10
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] == 3600
+
+
+def test_engine_options_sqlite():
+    """
+    Given: A SQLite database type.
+    When: Building the engine options.
+    Then: Only the SQLite connect arguments should be set.
+    """
+    assert engine_options("sqlite") == {
+        "connect_args": {"check_same_thread": False}
+    }
+
+
+def test_get_session_closes_session():
+    """
+    Given: A session provided by the get_session dependency.
+    When: The request using it has been handled.
+    Then: The session should be closed and its transaction ended.
+    """
+    sessions = get_session()
+    session = next(sessions)
+    session.execute(text("SELECT 1"))
+    assert session.in_transaction()
+
+    sessions.close()
+    assert not session.in_transaction()
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import declarative_base, relationship, selectinload
+
+Base = declarative_base()
+
+
+class Author(Base):
+    __tablename__ = "lazy_loading_authors"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    books = relationship("Book")
+
+
+class Book(Base):
+    __tablename__ = "lazy_loading_books"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    author_id = Column(Integer, ForeignKey("lazy_loading_authors.id"))
+
+
+@pytest.fixture(scope="module")
+def author(test_db_session):
+    Base.metadata.create_all(bind=test_db_session.get_bind())
+    author = Author(name="author", books=[Book(title="book")])
+    test_db_session.add(author)
+    test_db_session.commit()
+
+    yield author
+
+    test_db_session.close()
+    Base.metadata.drop_all(bind=test_db_session.get_bind())
+
+
+def test_lazy_loading_raises(test_db_session, author):
+    """
+    Test to ensure that the test session refuses to lazy load relationships.
+
+    Relationships that are not eagerly loaded by the query should raise on
+    access, so N+1 queries fail the test suite instead of passing silently.
+    """
+    test_db_session.expire_all()
+    loaded = test_db_session.query(Author).filter(Author.id == author.id).one()
+
+    with pytest.raises(InvalidRequestError):
+        loaded.books
+
+
+def test_eager_loading_is_allowed(test_db_session, author):
+    """
+    Test to ensure that relationships loaded with an explicit loader option
+    remain accessible under the lazy loading tripwire.
+    """
+    test_db_session.expire_all()
+    loaded = (
+        test_db_session.query(Author)
+        .options(selectinload(Author.books))
+        .filter(Author.id == author.id)
+        .one()
+    )
+
+    assert [book.title for book in loaded.books] == ["book"]
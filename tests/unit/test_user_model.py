@@ -18,3 +18,25 @@ def test_user_model():
     assert isinstance(User.username.property.columns[0].type, String)
     assert isinstance(User.email.property.columns[0].type, String)
     assert isinstance(User.password.property.columns[0].type, String)
+
+
+def test_user_model_sort_indexes():
+    """
+    Test to ensure that the User model indexes the timestamp sort columns
+    together with the primary key, matching the keyset pagination order.
+    """
+    indexes = {
+        index.name: [column.name for column in index.columns]
+        for index in User.__table__.indexes
+    }
+    assert indexes["ix_users_created_at_id"] == ["created_at", "id"]
+    assert indexes["ix_users_updated_at_id"] == ["updated_at", "id"]
+
+
+def test_user_model_required_columns():
+    """
+    Test to ensure that username and email are NOT NULL, so listings keyset
+    paginated by them never compare against a NULL.
+    """
+    assert User.username.property.columns[0].nullable is False
+    assert User.email.property.columns[0].nullable is False
@@ -1,21 +1,32 @@
+import base64
+import json
+from collections import namedtuple
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 
 import pytest
+from pydantic import ValidationError
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import IntegrityError
 
 from app.exceptions.user import (
     DuplicateUserError,
+    InvalidCursorError,
     InvalidSortFieldError,
     UserNotFoundError,
 )
 from app.models.user import User
 from app.requests.user import UserCreateRequest, UserUpdateRequest
 from app.responses.user import (
+    CursorPagination,
     UserCreateResponse,
     UserResponse,
     UserUpdateResponse,
 )
 from app.services.user import UserService
 
+PageRow = namedtuple("PageRow", ["User", "total"])
+
 
 class MockSession:
     def __init__(self):
@@ -24,6 +35,11 @@ class MockSession:
 
     def query(self, model):
         self.filtered_users = self.users
+        self.with_total = False
+        return self
+
+    def add_columns(self, *columns):
+        self.with_total = True
         return self
 
     # def filter(self, *conditions):
@@ -98,6 +114,12 @@ class MockSession:
     def first(self):
         return self.filtered_users[0] if self.filtered_users else None
 
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name="sqlite"))
+
+    def get(self, model, id):
+        return next((user for user in self.users if user.id == id), None)
+
     def offset(self, offset):
         self.pagination_offset = offset
         return self
@@ -111,7 +133,11 @@ class MockSession:
         end = start + getattr(
             self, "pagination_limit", len(self.filtered_users)
         )
-        return self.filtered_users[start:end]
+        users = self.filtered_users[start:end]
+        if self.with_total:
+            total = len(self.filtered_users)
+            return [PageRow(user, total) for user in users]
+        return users
 
     def count(self):
         return len(self.filtered_users)
@@ -141,6 +167,9 @@ class MockSession:
     def order_by(self, *args, **kwargs):
         return self
 
+    def options(self, *args):
+        return self
+
 
 @pytest.fixture
 def mock_db_session():
@@ -148,13 +177,13 @@ def mock_db_session():
 
 
 @pytest.fixture
-def user_service(test_db_session):
+def user_service(clean_users):
     """Fixture to provide a UserService instance with a test database session."""
-    return UserService(db=test_db_session)
+    return UserService(db=clean_users)
 
 
 @pytest.fixture
-def create_test_users(test_db_session):
+def create_test_users(clean_users):
     """Fixture to create sample users in the database."""
     user1 = User(
         username="user1",
@@ -168,8 +197,22 @@ def create_test_users(test_db_session):
         created_at=datetime(2022, 1, 20),
         updated_at=datetime(2022, 1, 20),
     )
-    test_db_session.add_all([user1, user2])
-    test_db_session.commit()
+    clean_users.add_all([user1, user2])
+    clean_users.commit()
+
+
+def test_clean_users_is_visible_to_test_db_session(
+    clean_users, test_db_session
+):
+    clean_users.add(User(username="cleanuser", email="clean@example.com"))
+    clean_users.commit()
+
+    assert (
+        test_db_session.query(User)
+        .filter(User.username == "cleanuser")
+        .count()
+        == 1
+    )
 
 
 def create_test_user(
@@ -217,12 +260,99 @@ def test_all_with_pagination_and_sorting(mock_db_session):
     assert users[-1].id == 6
 
 
+def test_all_uses_estimated_total_on_postgresql(mock_db_session, mocker):
+    for i in range(7):
+        mock_db_session.add(create_test_user(id=i + 1))
+    mocker.patch.object(
+        mock_db_session,
+        "get_bind",
+        return_value=SimpleNamespace(
+            dialect=SimpleNamespace(name="postgresql")
+        ),
+    )
+    mock_db_session.execute = mocker.Mock(
+        return_value=mocker.Mock(scalar=mocker.Mock(return_value=1000))
+    )
+
+    user_service = UserService(db=mock_db_session)
+    _, total, last_page, _, _ = user_service.all(page=1, items_per_page=5)
+
+    assert total == 1000
+    assert last_page == 200
+
+    _, total, _, _, _ = user_service.all(
+        page=1, items_per_page=5, username="testuser"
+    )
+    assert total == 7
+
+
+def test_all_clamps_stale_estimate_to_the_page(mock_db_session, mocker):
+    for i in range(7):
+        mock_db_session.add(create_test_user(id=i + 1))
+    mocker.patch.object(
+        mock_db_session,
+        "get_bind",
+        return_value=SimpleNamespace(
+            dialect=SimpleNamespace(name="postgresql")
+        ),
+    )
+    mock_db_session.execute = mocker.Mock(
+        return_value=mocker.Mock(scalar=mocker.Mock(return_value=0))
+    )
+
+    user_service = UserService(db=mock_db_session)
+    users, total, last_page, first_item, last_item = user_service.all(
+        page=1, items_per_page=5
+    )
+
+    assert len(users) == 5
+    assert total == 6
+    assert last_page == 2
+    assert (first_item, last_item) == (1, 5)
+
+
+def test_all_skips_count_on_last_page(mock_db_session, mocker):
+    for i in range(7):
+        mock_db_session.add(create_test_user(id=i + 1))
+    count = mocker.spy(mock_db_session, "count")
+
+    user_service = UserService(db=mock_db_session)
+    users, total, last_page, first_item, last_item = user_service.all(
+        page=2, items_per_page=5
+    )
+
+    assert len(users) == 2
+    assert total == 7
+    assert last_page == 2
+    assert (first_item, last_item) == (6, 7)
+
+    users, total, _, _, _ = user_service.all(
+        page=1, items_per_page=5, username="nobody"
+    )
+    assert users == []
+    assert total == 0
+    count.assert_not_called()
+
+    users, total, _, _, _ = user_service.all(page=3, items_per_page=5)
+    assert users == []
+    assert total == 7
+    count.assert_called_once()
+
+
 def test_invalid_sort_field(mock_db_session):
     user_service = UserService(db=mock_db_session)
     with pytest.raises(InvalidSortFieldError):
         user_service.all(1, 5, sort_by="invalid_field")
 
 
+def test_unsortable_field(mock_db_session):
+    user_service = UserService(db=mock_db_session)
+    with pytest.raises(InvalidSortFieldError):
+        user_service.all(1, 5, sort_by="password")
+    with pytest.raises(InvalidSortFieldError):
+        user_service.cursor(sort_by="metadata")
+
+
 def test_filter_users_by_username(mock_db_session):
     mock_db_session.add(create_test_user(id=5, username="user5"))
 
@@ -297,6 +427,20 @@ def test_update_user(mock_db_session):
     assert updated_user.email == "updated_user@example.com"
 
 
+@pytest.mark.parametrize("field", ["username", "email"])
+def test_update_request_rejects_null(field):
+    with pytest.raises(ValidationError):
+        UserUpdateRequest(**{field: None})
+
+
+def test_user_without_username_is_rejected(clean_users):
+    clean_users.add(User(email="nameless@example.com"))
+
+    with pytest.raises(IntegrityError):
+        clean_users.commit()
+    clean_users.rollback()
+
+
 def test_update_user_not_found(mock_db_session):
     user_service = UserService(db=mock_db_session)
     user_request = UserUpdateRequest(
@@ -357,3 +501,194 @@ def test_bulk_delete_no_users_found(mock_db_session):
 
     with pytest.raises(UserNotFoundError):
         user_service.bulk_delete([999, 1000])
+
+
+@pytest.fixture
+def create_cursor_test_users(clean_users):
+    """Fixture to create users in a date range not shared with other tests."""
+    users = [
+        User(
+            username=f"cursoruser{i}",
+            email=f"cursoruser{i}@example.com",
+            created_at=datetime(2021, 6, 1) + timedelta(days=i % 3),
+            updated_at=datetime(2021, 6, 1),
+        )
+        for i in range(1, 6)
+    ]
+    clean_users.add_all(users)
+    clean_users.commit()
+
+    return users
+
+
+def collect_cursor_pages(user_service, **kwargs):
+    pages = []
+    cursor = None
+    while True:
+        users, next_cursor, prev_cursor = user_service.cursor(
+            cursor=cursor,
+            items_per_page=2,
+            start_date=datetime(2021, 6, 1),
+            end_date=datetime(2021, 6, 30),
+            **kwargs,
+        )
+        pages.append((users, next_cursor, prev_cursor))
+        if not next_cursor:
+            return pages
+        cursor = next_cursor
+
+
+def test_cursor_pagination(user_service, create_cursor_test_users):
+    pages = collect_cursor_pages(user_service)
+
+    assert [[user.username for user in users] for users, _, _ in pages] == [
+        ["cursoruser1", "cursoruser2"],
+        ["cursoruser3", "cursoruser4"],
+        ["cursoruser5"],
+    ]
+    assert pages[0][2] is None
+    assert pages[-1][1] is None
+
+
+def test_cursor_pagination_sorted_by_date_desc(
+    user_service, create_cursor_test_users
+):
+    pages = collect_cursor_pages(
+        user_service, sort_type="desc", sort_by="created_at"
+    )
+
+    usernames = [user.username for users, _, _ in pages for user in users]
+    assert usernames == [
+        "cursoruser5",
+        "cursoruser2",
+        "cursoruser4",
+        "cursoruser1",
+        "cursoruser3",
+    ]
+
+
+def test_cursor_pagination_prev_cursor(user_service, create_cursor_test_users):
+    pages = collect_cursor_pages(user_service, sort_by="created_at")
+
+    users, next_cursor, prev_cursor = user_service.cursor(
+        cursor=pages[1][2],
+        items_per_page=2,
+        sort_by="created_at",
+        start_date=datetime(2021, 6, 1),
+        end_date=datetime(2021, 6, 30),
+    )
+
+    assert [user.id for user in users] == [user.id for user in pages[0][0]]
+    assert next_cursor == pages[0][1]
+    assert prev_cursor is None
+
+
+def test_cursor_pagination_invalid_cursor(user_service):
+    with pytest.raises(InvalidCursorError):
+        user_service.cursor(cursor="not-a-cursor")
+
+
+def test_cursor_pagination_cursor_for_other_sort_field(
+    user_service, create_cursor_test_users
+):
+    _, next_cursor, _ = user_service.cursor(items_per_page=1, sort_by="id")
+
+    with pytest.raises(InvalidCursorError):
+        user_service.cursor(cursor=next_cursor, sort_by="username")
+
+
+@pytest.mark.parametrize(
+    "sort_by, value, id",
+    [
+        ("id", {"a": 1}, 1),
+        ("id", "1", 1),
+        ("id", True, 1),
+        ("username", 1, 1),
+        ("created_at", 1, 1),
+        ("created_at", None, 1),
+        ("username", None, 1),
+        ("id", 1, "1"),
+    ],
+)
+def test_cursor_pagination_tampered_cursor_value(
+    user_service, sort_by, value, id
+):
+    payload = {"sort_by": sort_by, "value": value, "id": id}
+    cursor = base64.urlsafe_b64encode(
+        json.dumps({**payload, "direction": "next"}).encode()
+    ).decode()
+
+    with pytest.raises(InvalidCursorError):
+        user_service.cursor(cursor=cursor, sort_by=sort_by)
+
+
+def test_listing_defers_password(user_service, create_cursor_test_users):
+    users = user_service._filtered_query(username="cursoruser1").all()
+
+    assert len(users) == 1
+    assert "password" in inspect(users[0]).unloaded
+
+
+def test_get_by_id_uses_identity_map(
+    user_service, create_cursor_test_users, mocker
+):
+    user = create_cursor_test_users[0]
+    user_service.get_by_id(user.id)
+    execute = mocker.spy(user_service.db, "execute")
+
+    assert user_service.get_by_id(user.id) is user
+    execute.assert_not_called()
+
+
+def test_all_counts_in_the_page_query(user_service, create_cursor_test_users):
+    statements = []
+    connection = user_service.db.connection()
+    event.listen(
+        connection,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    users, total, last_page, _, _ = user_service.all(
+        page=2,
+        items_per_page=2,
+        start_date=datetime(2021, 6, 1),
+        end_date=datetime(2021, 6, 30),
+    )
+
+    assert [user.username for user in users] == ["cursoruser3", "cursoruser4"]
+    assert (total, last_page) == (5, 3)
+    assert len(statements) == 1
+    assert "OVER ()" in statements[0]
+
+
+def test_stream(user_service, create_cursor_test_users):
+    date_filter = {
+        "start_date": datetime(2021, 6, 1),
+        "end_date": datetime(2021, 6, 30),
+    }
+    users, next_cursor, prev_cursor = user_service.cursor(
+        items_per_page=2, **date_filter
+    )
+
+    *streamed, meta = user_service.stream(items_per_page=2, **date_filter)
+
+    assert [user.id for user in streamed] == [user.id for user in users]
+    assert isinstance(meta, CursorPagination)
+    assert meta.next_cursor == next_cursor
+    assert meta.prev_cursor == prev_cursor
+
+    *streamed, meta = user_service.stream(
+        cursor=next_cursor, items_per_page=10, **date_filter
+    )
+    assert [user.username for user in streamed] == [
+        "cursoruser3",
+        "cursoruser4",
+        "cursoruser5",
+    ]
+    assert meta.next_cursor is None
+
+
+def test_stream_validates_before_streaming(user_service):
+    with pytest.raises(InvalidCursorError):
+        user_service.stream(cursor="not-a-cursor")